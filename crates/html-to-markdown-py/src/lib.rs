@@ -25,6 +25,7 @@ use html_to_markdown_rs::{DEFAULT_INLINE_IMAGE_LIMIT, InlineImageConfig as RustI
 #[cfg(feature = "async-visitor")]
 use once_cell::sync::OnceCell;
 use pyo3::prelude::*;
+use pyo3::pybacked::PyBackedStr;
 #[cfg(feature = "inline-images")]
 use pyo3::types::PyBytes;
 #[cfg(any(feature = "inline-images", feature = "metadata"))]
@@ -563,12 +564,11 @@ fn convert(
     options: Option<ConversionOptions>,
     visitor: Option<Py<PyAny>>,
 ) -> PyResult<String> {
-    let html = html.to_owned();
     let rust_options = options.map(|opts| opts.to_rust());
 
     let Some(visitor_py) = visitor else {
         return py
-            .detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(&html, rust_options.clone())))
+            .detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(html, rust_options.clone())))
             .map_err(to_py_err);
     };
 
@@ -584,7 +584,7 @@ fn convert(
                     Rc::new(RefCell::new(bridge_copy)) as Rc<RefCell<dyn HtmlVisitor>>
                 })
             };
-            html_to_markdown_rs::convert_with_visitor(&html, rust_options.clone(), Some(rc_visitor))
+            html_to_markdown_rs::convert_with_visitor(html, rust_options.clone(), Some(rc_visitor))
         })
     })
     .map_err(to_py_err)
@@ -604,30 +604,49 @@ fn convert(
             "Visitor support requires the 'visitor' feature to be enabled",
         ));
     }
-    let html = html.to_owned();
     let rust_options = options.map(|opts| opts.to_rust());
-    py.detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(&html, rust_options.clone())))
+    py.detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(html, rust_options.clone())))
         .map_err(to_py_err)
 }
 
 #[pyfunction]
 #[pyo3(signature = (html, options_json=None))]
 fn convert_json(py: Python<'_>, html: &str, options_json: Option<&str>) -> PyResult<String> {
-    let html = html.to_owned();
     let rust_options = parse_conversion_options(options_json).map_err(to_py_err)?;
-    py.detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(&html, rust_options.clone())))
+    py.detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(html, rust_options.clone())))
         .map_err(to_py_err)
 }
 
 #[pyfunction]
 #[pyo3(signature = (html, handle))]
 fn convert_with_options_handle(py: Python<'_>, html: &str, handle: &ConversionOptionsHandle) -> PyResult<String> {
-    let html = html.to_owned();
     let rust_options = handle.inner.clone();
-    py.detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(&html, Some(rust_options.clone()))))
+    py.detach(move || run_with_guard_and_profile(|| html_to_markdown_rs::convert(html, Some(rust_options.clone()))))
         .map_err(to_py_err)
 }
 
+/// Convert a batch of HTML documents in a single native call.
+///
+/// The whole batch runs with the GIL released, so per-document argument
+/// marshalling and GIL hand-offs are paid once rather than once per call.
+#[pyfunction]
+#[pyo3(signature = (htmls, handle=None))]
+fn convert_many(
+    py: Python<'_>,
+    htmls: Vec<PyBackedStr>,
+    handle: Option<PyRef<'_, ConversionOptionsHandle>>,
+) -> PyResult<Vec<String>> {
+    let rust_options = handle.map(|handle| handle.inner.clone());
+    // Borrow each document's UTF-8 buffer instead of copying it into a String
+    py.detach(|| {
+        htmls
+            .iter()
+            .map(|html| run_with_guard_and_profile(|| html_to_markdown_rs::convert(&**html, rust_options.clone())))
+            .collect::<html_to_markdown_rs::Result<Vec<String>>>()
+    })
+    .map_err(to_py_err)
+}
+
 #[pyfunction]
 #[pyo3(signature = (options=None))]
 fn create_options_handle(options: Option<ConversionOptions>) -> ConversionOptionsHandle {
@@ -2841,6 +2860,7 @@ fn _html_to_markdown(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(convert, m)?)?;
     m.add_function(wrap_pyfunction!(convert_json, m)?)?;
     m.add_function(wrap_pyfunction!(convert_with_options_handle, m)?)?;
+    m.add_function(wrap_pyfunction!(convert_many, m)?)?;
     m.add_function(wrap_pyfunction!(create_options_handle, m)?)?;
     m.add_function(wrap_pyfunction!(create_options_handle_json, m)?)?;
     m.add_class::<ConversionOptions>()?;
@@ -2886,6 +2906,36 @@ mod tests {
         .expect("conversion succeeds");
     }
 
+    #[test]
+    fn test_convert_many_returns_markdown_in_order() {
+        Python::initialize();
+        Python::attach(|py| -> PyResult<()> {
+            let htmls = vec![
+                pyo3::types::PyString::new(py, "<h1>First</h1>").extract::<PyBackedStr>()?,
+                pyo3::types::PyString::new(py, "<p>Second</p>").extract::<PyBackedStr>()?,
+            ];
+            let result = convert_many(py, htmls, None)?;
+            assert_eq!(result.len(), 2);
+            assert!(result[0].contains("First"));
+            assert!(result[1].contains("Second"));
+            Ok(())
+        })
+        .expect("batch conversion succeeds");
+    }
+
+    #[test]
+    fn test_convert_many_handles_non_ascii_documents() {
+        Python::initialize();
+        Python::attach(|py| -> PyResult<()> {
+            let htmls = vec![pyo3::types::PyString::new(py, "<p>Héllo — 日本語</p>").extract::<PyBackedStr>()?];
+            let result = convert_many(py, htmls, None)?;
+            assert_eq!(result.len(), 1);
+            assert!(result[0].contains("Héllo — 日本語"));
+            Ok(())
+        })
+        .expect("batch conversion succeeds");
+    }
+
     #[test]
     fn test_conversion_options_defaults() {
         let opts = ConversionOptions::new(
@@ -10,6 +10,7 @@ Usage:
     python benchmark-fixtures.py --size medium
     python benchmark-fixtures.py --size large
     python benchmark-fixtures.py --all
+    python benchmark-fixtures.py --all --pin-cpu
 """
 
 from __future__ import annotations
@@ -18,149 +19,125 @@ import argparse
 import sys
 
 try:
-    from html_to_markdown import ConversionOptions, convert_with_handle, create_options_handle
+    from html_to_markdown import convert_many
 except ImportError:
     sys.exit(1)
 
-from utils import FIXTURES, TimingMeasurement, format_number, print_result_row, print_section_header
+from utils import (
+    FIXTURES,
+    BenchResult,
+    Fixture,
+    OutputBuffer,
+    TimingMeasurement,
+    format_number,
+    get_options_handle,
+    pin_to_cpu,
+    select_results,
+    warmup_iterations,
+    write_json_results,
+)
 
 
 def run_benchmark(
-    html: str,
-    fixture_name: str,
-    fixture_size: str,
+    fixture: Fixture,
     iterations: int = 50,
-) -> dict[str, float]:
+) -> BenchResult:
     """
     Run benchmark on a single fixture.
 
     Args:
-        html: HTML content to convert
-        fixture_name: Display name of fixture
-        fixture_size: Size category (small/medium/large)
+        fixture: Fixture to convert
         iterations: Number of iterations to run
 
     Returns:
-        Dictionary with benchmark results
+        Benchmark results
     """
-    html_bytes = len(html.encode("utf-8"))
+    html = fixture.html
 
-    # Warmup run (not counted)
-    convert_with_handle(html, None)
+    # Warmup runs (not counted)
+    convert_many([html] * warmup_iterations(iterations), None)
 
-    # Measure conversions
-    with TimingMeasurement() as timer:
-        for _ in range(iterations):
-            convert_with_handle(html, None)
-
-    # Calculate metrics
-    avg_time_ms = (timer.elapsed / iterations) * 1000
-    throughput_docs_sec = iterations / timer.elapsed
-    bytes_processed = html_bytes * iterations
-    bandwidth_mb_sec = (bytes_processed / (1024 * 1024)) / timer.elapsed
-
-    return {
-        "fixture": fixture_name,
-        "size_category": fixture_size,
-        "html_size_bytes": html_bytes,
-        "iterations": iterations,
-        "total_time_sec": timer.elapsed,
-        "avg_time_ms": avg_time_ms,
-        "throughput_docs_sec": throughput_docs_sec,
-        "bandwidth_mb_sec": bandwidth_mb_sec,
-    }
+    # Measure conversions in one native batch to keep per-call overhead out of the timing
+    batch = [html] * iterations
+    with TimingMeasurement(disable_gc=True) as timer:
+        convert_many(batch, None)
+
+    return BenchResult.from_elapsed(fixture.name, fixture.size, fixture.html_bytes, iterations, timer.elapsed)
 
 
 def run_with_options_benchmark(
-    html: str,
-    fixture_name: str,
-    fixture_size: str,
+    fixture: Fixture,
     iterations: int = 50,
-) -> dict[str, float]:
+) -> BenchResult:
     """
     Benchmark with ConversionOptions (shows overhead of option handling).
 
     Args:
-        html: HTML content to convert
-        fixture_name: Display name of fixture
-        fixture_size: Size category (small/medium/large)
+        fixture: Fixture to convert
         iterations: Number of iterations to run
 
     Returns:
-        Dictionary with benchmark results
+        Benchmark results
     """
-    html_bytes = len(html.encode("utf-8"))
+    html = fixture.html
 
-    # Create options handle (recommended approach for repeated conversions)
-    options = ConversionOptions(sanitize=True)
-    handle = create_options_handle(options)
+    # Reuse a cached options handle (recommended approach for repeated conversions)
+    handle = get_options_handle(sanitize=True)
 
-    # Warmup run
-    convert_with_handle(html, handle)
+    # Warmup runs
+    convert_many([html] * warmup_iterations(iterations), handle)
 
     # Measure conversions
-    with TimingMeasurement() as timer:
-        for _ in range(iterations):
-            convert_with_handle(html, handle)
-
-    # Calculate metrics
-    avg_time_ms = (timer.elapsed / iterations) * 1000
-    throughput_docs_sec = iterations / timer.elapsed
-    bytes_processed = html_bytes * iterations
-    bandwidth_mb_sec = (bytes_processed / (1024 * 1024)) / timer.elapsed
-
-    return {
-        "fixture": fixture_name,
-        "size_category": fixture_size,
-        "scenario": "with_options",
-        "html_size_bytes": html_bytes,
-        "iterations": iterations,
-        "total_time_sec": timer.elapsed,
-        "avg_time_ms": avg_time_ms,
-        "throughput_docs_sec": throughput_docs_sec,
-        "bandwidth_mb_sec": bandwidth_mb_sec,
-    }
-
-
-def print_results(results: list[dict[str, float]]) -> None:
-    """Print benchmark results in formatted tables."""
-    # Group by scenario
-    default_results = [r for r in results if "scenario" not in r]
-    options_results = [r for r in results if r.get("scenario") == "with_options"]
-
-    print_section_header("Benchmark Results - Default Conversion")
-    if default_results:
-        for result in default_results:
-            print_result_row("Fixture", result["fixture"])
-            print_result_row("Size (bytes)", format_number(result["html_size_bytes"], 0))
-            print_result_row("Avg Time (ms)", f"{result['avg_time_ms']:.3f}")
-            print_result_row("Throughput (docs/sec)", format_number(result["throughput_docs_sec"], 1))
-            print_result_row("Bandwidth (MB/s)", f"{result['bandwidth_mb_sec']:.2f}")
-            print()
-
-    if options_results:
-        print_section_header("Benchmark Results - With Options")
-        for result in options_results:
-            print_result_row("Fixture", result["fixture"])
-            print_result_row("Size (bytes)", format_number(result["html_size_bytes"], 0))
-            print_result_row("Avg Time (ms)", f"{result['avg_time_ms']:.3f}")
-            print_result_row("Throughput (docs/sec)", format_number(result["throughput_docs_sec"], 1))
-            print_result_row("Bandwidth (MB/s)", f"{result['bandwidth_mb_sec']:.2f}")
-            print()
-
-        print_section_header("Options Overhead Comparison")
-        for default, options in zip(default_results, options_results, strict=False):
-            overhead_pct = ((options["avg_time_ms"] - default["avg_time_ms"]) / default["avg_time_ms"]) * 100
-            print_result_row(default["fixture"], f"{overhead_pct:+.1f}%")
-            print()
-
-    print_section_header("Summary by Size Category")
-    for category in ["small", "medium", "large"]:
-        cat_results = [r for r in default_results if r["size_category"] == category]
-        if cat_results:
-            result = cat_results[0]
-            print_result_row(result["fixture"], f"{result['avg_time_ms']:.3f} ms")
-            print()
+    batch = [html] * iterations
+    with TimingMeasurement(disable_gc=True) as timer:
+        convert_many(batch, handle)
+
+    return BenchResult.from_elapsed(
+        fixture.name, fixture.size, fixture.html_bytes, iterations, timer.elapsed, scenario="with_options"
+    )
+
+
+def print_results(results: dict[tuple[str, str], BenchResult]) -> None:
+    """Print benchmark results, keyed by (scenario, size category), in formatted tables."""
+    with OutputBuffer() as out:
+        default_results = select_results(results, "default")
+        options_results = select_results(results, "with_options")
+
+        out.header("Benchmark Results - Default Conversion")
+        if default_results:
+            for result in default_results:
+                out.row("Fixture", result.fixture)
+                out.row("Size (bytes)", format_number(result.html_size_bytes, 0))
+                out.row("Avg Time (ms)", f"{result.avg_time_ms:.3f}")
+                out.row("Throughput (docs/sec)", format_number(result.throughput_docs_sec, 1))
+                out.row("Bandwidth (MB/s)", f"{result.bandwidth_mb_sec:.2f}")
+                out.blank()
+
+        if options_results:
+            out.header("Benchmark Results - With Options")
+            for result in options_results:
+                out.row("Fixture", result.fixture)
+                out.row("Size (bytes)", format_number(result.html_size_bytes, 0))
+                out.row("Avg Time (ms)", f"{result.avg_time_ms:.3f}")
+                out.row("Throughput (docs/sec)", format_number(result.throughput_docs_sec, 1))
+                out.row("Bandwidth (MB/s)", f"{result.bandwidth_mb_sec:.2f}")
+                out.blank()
+
+            out.header("Options Overhead Comparison")
+            for default in default_results:
+                options = results.get(("with_options", default.size_category))
+                if options is None:
+                    continue
+                overhead_pct = ((options.avg_time_ms - default.avg_time_ms) / default.avg_time_ms) * 100
+                out.row(default.fixture, f"{overhead_pct:+.1f}%")
+                out.blank()
+
+        out.header("Summary by Size Category")
+        for category in ["small", "medium", "large"]:
+            result = results.get(("default", category))
+            if result:
+                out.row(result.fixture, f"{result.avg_time_ms:.3f} ms")
+                out.blank()
 
 
 def main() -> None:
@@ -187,37 +164,43 @@ def main() -> None:
         action="store_true",
         help="Also benchmark with ConversionOptions",
     )
+    parser.add_argument(
+        "--pin-cpu",
+        action="store_true",
+        help="Pin to one CPU ($BENCH_CPU or the highest available) to reduce timing variance",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Write results as JSON instead of formatted tables",
+    )
 
     args = parser.parse_args()
 
-    # Determine which fixtures to run
-    sizes_to_run = [args.size] if args.size else list(FIXTURES.keys())
+    if args.pin_cpu and pin_to_cpu() is not None:
+        # Nothing else runs in this process, so stop the interpreter from
+        # interrupting the measured thread to offer the GIL
+        sys.setswitchinterval(1.0)
 
-    # Run benchmarks
-    results = []
-    for size in sizes_to_run:
-        fixture = FIXTURES[size]
+    # Determine which fixtures to run
+    fixtures_to_run = [fixture for fixture in FIXTURES if args.size in {None, fixture.size}]
 
-        result = run_benchmark(
-            fixture["html"],
-            fixture["name"],
-            size,
-            iterations=args.iterations,
-        )
-        results.append(result)
+    # Run benchmarks, indexing results by (scenario, size category) as they are produced
+    results: dict[tuple[str, str], BenchResult] = {}
+    for fixture in fixtures_to_run:
+        result = run_benchmark(fixture, iterations=args.iterations)
+        results[result.scenario, fixture.size] = result
 
         # Run with options if requested
         if args.with_options:
-            result_opts = run_with_options_benchmark(
-                fixture["html"],
-                fixture["name"],
-                size,
-                iterations=args.iterations,
-            )
-            results.append(result_opts)
+            result_opts = run_with_options_benchmark(fixture, iterations=args.iterations)
+            results[result_opts.scenario, fixture.size] = result_opts
 
     # Print results
-    print_results(results)
+    if args.json:
+        write_json_results(results.values())
+    else:
+        print_results(results)
 
 
 if __name__ == "__main__":
@@ -3,187 +3,211 @@
 Memory profiling for html-to-markdown conversion.
 
 Tracks peak memory usage during conversion and compares different scenarios.
-Uses tracemalloc for accurate memory measurement.
+Traces Python allocations exactly with tracemalloc by default; pass --rss to
+sample process RSS instead, which includes memory allocated by the Rust core
+but is only meaningful for long-running, allocation-heavy scenarios.
 
 Usage:
     python memory-profiling.py --size small
     python memory-profiling.py --size medium
     python memory-profiling.py --all
+    python memory-profiling.py --all --rss
 """
 
 from __future__ import annotations
 
 import argparse
 import sys
-from typing import Any
+from dataclasses import dataclass
 
 try:
-    from html_to_markdown import (
-        ConversionOptions,
-        MetadataConfig,
-        convert,
-        convert_with_handle,
-        convert_with_metadata,
-        create_options_handle,
-    )
+    from html_to_markdown import convert, convert_with_handle, convert_with_metadata
 except ImportError:
     sys.exit(1)
 
-from utils import FIXTURES, MemoryTracker, print_result_row, print_section_header
+from utils import (
+    FIXTURES,
+    Fixture,
+    MemoryTracker,
+    OutputBuffer,
+    get_metadata_config,
+    get_options_handle,
+    select_results,
+    shutdown_tracker,
+    write_json_results,
+)
+
+
+@dataclass(slots=True)
+class MemoryResult:
+    """Peak memory for a single conversion scenario."""
+
+    fixture: str
+    size_category: str
+    html_size_bytes: int
+    scenario: str
+    peak_memory_kb: float
+    peak_memory_mb: float
+    ratio_html_to_memory: float
+
+
+@dataclass(slots=True)
+class BatchMemoryResult:
+    """Peak memory for converting a batch of documents."""
+
+    fixture: str
+    size_category: str
+    html_size_bytes: int
+    batch_size: int
+    total_html_bytes: int
+    peak_memory_kb: float
+    peak_memory_mb: float
+    memory_per_document_kb: float
+    ratio_total_to_memory: float
+    scenario: str = "batch_processing"
 
 
 def measure_conversion(
-    html: str,
-    fixture_name: str,
-    fixture_size: str,
+    fixture: Fixture,
     scenario: str = "default",
-) -> dict[str, Any]:
+    *,
+    precise: bool = True,
+) -> MemoryResult:
     """
     Measure memory usage for a single conversion.
 
     Args:
-        html: HTML content to convert
-        fixture_name: Display name of fixture
-        fixture_size: Size category (small/medium/large)
+        fixture: Fixture to convert
         scenario: Conversion scenario (default/with_options/with_metadata)
+        precise: Trace allocations with tracemalloc; pass False to sample RSS
 
     Returns:
-        Dictionary with memory measurement results
+        Memory measurement results
     """
-    html_bytes = len(html.encode("utf-8"))
+    html = fixture.html
+    html_bytes = fixture.html_bytes
 
-    with MemoryTracker(fixture_name) as tracker:
+    with MemoryTracker(fixture.name, precise=precise) as tracker:
         if scenario == "default":
             convert(html)
         elif scenario == "with_options":
-            options = ConversionOptions(sanitize=True)
-            handle = create_options_handle(options)
+            handle = get_options_handle(sanitize=True)
             convert_with_handle(html, handle)
         elif scenario == "with_metadata":
-            config = MetadataConfig(
+            config = get_metadata_config(
                 extract_headers=True,
                 extract_links=True,
                 extract_images=True,
             )
             convert_with_metadata(html, metadata_config=config)
 
-    return {
-        "fixture": fixture_name,
-        "size_category": fixture_size,
-        "html_size_bytes": html_bytes,
-        "scenario": scenario,
-        "peak_memory_kb": tracker.memory_used_kb,
-        "peak_memory_mb": tracker.memory_used_mb,
-        "ratio_html_to_memory": tracker.peak_memory / html_bytes if html_bytes > 0 else 0,
-    }
+    return MemoryResult(
+        fixture=fixture.name,
+        size_category=fixture.size,
+        html_size_bytes=html_bytes,
+        scenario=scenario,
+        peak_memory_kb=tracker.memory_used_kb,
+        peak_memory_mb=tracker.memory_used_mb,
+        ratio_html_to_memory=tracker.peak_memory / html_bytes if html_bytes > 0 else 0,
+    )
 
 
 def measure_batch_processing(
-    html: str,
-    fixture_name: str,
-    fixture_size: str,
+    fixture: Fixture,
     batch_size: int = 10,
-) -> dict[str, Any]:
+    *,
+    precise: bool = True,
+) -> BatchMemoryResult:
     """
     Measure memory for batch processing scenario.
 
     Args:
-        html: HTML content to convert
-        fixture_name: Display name of fixture
-        fixture_size: Size category (small/medium/large)
+        fixture: Fixture to convert
         batch_size: Number of documents to process
+        precise: Trace allocations with tracemalloc; pass False to sample RSS
 
     Returns:
-        Dictionary with memory measurement results
+        Memory measurement results
     """
-    html_bytes = len(html.encode("utf-8"))
+    html = fixture.html
+    html_bytes = fixture.html_bytes
     total_bytes = html_bytes * batch_size
 
-    with MemoryTracker("Batch processing") as tracker:
+    with MemoryTracker("Batch processing", precise=precise) as tracker:
         for _ in range(batch_size):
             convert(html)
 
-    return {
-        "fixture": fixture_name,
-        "size_category": fixture_size,
-        "html_size_bytes": html_bytes,
-        "batch_size": batch_size,
-        "total_html_bytes": total_bytes,
-        "scenario": "batch_processing",
-        "peak_memory_kb": tracker.memory_used_kb,
-        "peak_memory_mb": tracker.memory_used_mb,
-        "memory_per_document_kb": tracker.memory_used_kb / batch_size,
-        "ratio_total_to_memory": tracker.peak_memory / total_bytes if total_bytes > 0 else 0,
-    }
-
-
-def print_memory_results(results: list[dict[str, Any]]) -> None:
-    """Print memory profiling results in formatted tables."""
-    # Group by scenario
-    default_results = [r for r in results if r.get("scenario") == "default"]
-    options_results = [r for r in results if r.get("scenario") == "with_options"]
-    metadata_results = [r for r in results if r.get("scenario") == "with_metadata"]
-    batch_results = [r for r in results if r.get("scenario") == "batch_processing"]
-
-    print_section_header("Memory Profile - Default Conversion")
-    if default_results:
-        for result in default_results:
-            print_result_row("Fixture", result["fixture"])
-            print_result_row("HTML size (bytes)", f"{result['html_size_bytes']:,}")
-            print_result_row("Peak memory (MB)", f"{result['peak_memory_mb']:.2f}")
-            print_result_row("Ratio (memory/HTML)", f"{result['ratio_html_to_memory']:.2f}x")
-            print()
-
-    print_section_header("Memory Profile - With Options")
-    if options_results:
-        for result in options_results:
-            print_result_row("Fixture", result["fixture"])
-            print_result_row("HTML size (bytes)", f"{result['html_size_bytes']:,}")
-            print_result_row("Peak memory (MB)", f"{result['peak_memory_mb']:.2f}")
-            print_result_row("Ratio (memory/HTML)", f"{result['ratio_html_to_memory']:.2f}x")
-            print()
-
-    print_section_header("Memory Profile - With Metadata")
-    if metadata_results:
-        for result in metadata_results:
-            print_result_row("Fixture", result["fixture"])
-            print_result_row("HTML size (bytes)", f"{result['html_size_bytes']:,}")
-            print_result_row("Peak memory (MB)", f"{result['peak_memory_mb']:.2f}")
-            print_result_row("Ratio (memory/HTML)", f"{result['ratio_html_to_memory']:.2f}x")
-            print()
-
-    print_section_header("Batch Processing Analysis")
-    if batch_results:
-        for result in batch_results:
-            print_result_row("Fixture", result["fixture"])
-            print_result_row("Batch size", result["batch_size"])
-            print_result_row("Total HTML size (MB)", f"{result['total_html_bytes'] / (1024 * 1024):.2f}")
-            print_result_row("Peak memory (MB)", f"{result['peak_memory_mb']:.2f}")
-            print_result_row("Memory per document (KB)", f"{result['memory_per_document_kb']:.2f}")
-            print()
-
-    print_section_header("Scenario Comparison by Size")
-    for size_cat in ["small", "medium", "large"]:
-        default = next(
-            (r for r in default_results if r.get("size_category") == size_cat),
-            None,
-        )
-        options = next(
-            (r for r in options_results if r.get("size_category") == size_cat),
-            None,
-        )
-        metadata = next(
-            (r for r in metadata_results if r.get("size_category") == size_cat),
-            None,
-        )
-
-        if default:
-            print_result_row(default["fixture"], f"Default: {default['peak_memory_mb']:.2f} MB")
-            if options:
-                print_result_row("", f"w/ Options: {options['peak_memory_mb']:.2f} MB")
-            if metadata:
-                print_result_row("", f"w/ Metadata: {metadata['peak_memory_mb']:.2f} MB")
-            print()
+    return BatchMemoryResult(
+        fixture=fixture.name,
+        size_category=fixture.size,
+        html_size_bytes=html_bytes,
+        batch_size=batch_size,
+        total_html_bytes=total_bytes,
+        peak_memory_kb=tracker.memory_used_kb,
+        peak_memory_mb=tracker.memory_used_mb,
+        memory_per_document_kb=tracker.memory_used_kb / batch_size,
+        ratio_total_to_memory=tracker.peak_memory / total_bytes if total_bytes > 0 else 0,
+    )
+
+
+def print_memory_results(results: dict[tuple[str, str], MemoryResult | BatchMemoryResult]) -> None:
+    """Print memory profiling results, keyed by (scenario, size category), in formatted tables."""
+    with OutputBuffer() as out:
+        default_results = select_results(results, "default")
+        options_results = select_results(results, "with_options")
+        metadata_results = select_results(results, "with_metadata")
+        batch_results = select_results(results, "batch_processing")
+
+        out.header("Memory Profile - Default Conversion")
+        if default_results:
+            for result in default_results:
+                out.row("Fixture", result.fixture)
+                out.row("HTML size (bytes)", f"{result.html_size_bytes:,}")
+                out.row("Peak memory (MB)", f"{result.peak_memory_mb:.2f}")
+                out.row("Ratio (memory/HTML)", f"{result.ratio_html_to_memory:.2f}x")
+                out.blank()
+
+        out.header("Memory Profile - With Options")
+        if options_results:
+            for result in options_results:
+                out.row("Fixture", result.fixture)
+                out.row("HTML size (bytes)", f"{result.html_size_bytes:,}")
+                out.row("Peak memory (MB)", f"{result.peak_memory_mb:.2f}")
+                out.row("Ratio (memory/HTML)", f"{result.ratio_html_to_memory:.2f}x")
+                out.blank()
+
+        out.header("Memory Profile - With Metadata")
+        if metadata_results:
+            for result in metadata_results:
+                out.row("Fixture", result.fixture)
+                out.row("HTML size (bytes)", f"{result.html_size_bytes:,}")
+                out.row("Peak memory (MB)", f"{result.peak_memory_mb:.2f}")
+                out.row("Ratio (memory/HTML)", f"{result.ratio_html_to_memory:.2f}x")
+                out.blank()
+
+        out.header("Batch Processing Analysis")
+        if batch_results:
+            for result in batch_results:
+                out.row("Fixture", result.fixture)
+                out.row("Batch size", result.batch_size)
+                out.row("Total HTML size (MB)", f"{result.total_html_bytes / (1024 * 1024):.2f}")
+                out.row("Peak memory (MB)", f"{result.peak_memory_mb:.2f}")
+                out.row("Memory per document (KB)", f"{result.memory_per_document_kb:.2f}")
+                out.blank()
+
+        out.header("Scenario Comparison by Size")
+        for size_cat in ["small", "medium", "large"]:
+            default = results.get(("default", size_cat))
+            options = results.get(("with_options", size_cat))
+            metadata = results.get(("with_metadata", size_cat))
+
+            if default:
+                out.row(default.fixture, f"Default: {default.peak_memory_mb:.2f} MB")
+                if options:
+                    out.row("", f"w/ Options: {options.peak_memory_mb:.2f} MB")
+                if metadata:
+                    out.row("", f"w/ Metadata: {metadata.peak_memory_mb:.2f} MB")
+                out.blank()
 
 
 def main() -> None:
@@ -205,38 +229,52 @@ def main() -> None:
         default=10,
         help="Number of documents for batch processing test (default: 10)",
     )
+    parser.add_argument(
+        "--rss",
+        action="store_true",
+        help="Sample process RSS instead of tracing Python allocations with tracemalloc",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Write results as JSON instead of formatted tables",
+    )
 
     args = parser.parse_args()
 
     # Determine which fixtures to run
-    sizes_to_run = []
-    sizes_to_run = [args.size] if args.size else list(FIXTURES.keys())
+    fixtures_to_run = [fixture for fixture in FIXTURES if args.size in {None, fixture.size}]
 
-    # Run profiling
-    results = []
+    # Run profiling, indexing results by (scenario, size category) as they are produced
+    results: dict[tuple[str, str], MemoryResult | BatchMemoryResult] = {}
 
-    for size in sizes_to_run:
-        fixture = FIXTURES[size]
-        html = fixture["html"]
+    for fixture in fixtures_to_run:
+        size = fixture.size
 
         # Test default conversion
-        result = measure_conversion(html, fixture["name"], size, scenario="default")
-        results.append(result)
+        result = measure_conversion(fixture, scenario="default", precise=not args.rss)
+        results[result.scenario, size] = result
 
         # Test with options
-        result = measure_conversion(html, fixture["name"], size, scenario="with_options")
-        results.append(result)
+        result = measure_conversion(fixture, scenario="with_options", precise=not args.rss)
+        results[result.scenario, size] = result
 
         # Test with metadata
-        result = measure_conversion(html, fixture["name"], size, scenario="with_metadata")
-        results.append(result)
+        result = measure_conversion(fixture, scenario="with_metadata", precise=not args.rss)
+        results[result.scenario, size] = result
 
         # Test batch processing
-        result = measure_batch_processing(html, fixture["name"], size, batch_size=args.batch_size)
-        results.append(result)
+        result = measure_batch_processing(fixture, batch_size=args.batch_size, precise=not args.rss)
+        results[result.scenario, size] = result
+
+    # Stop tracing before reporting so output is not slowed by tracemalloc
+    shutdown_tracker()
 
     # Print results
-    print_memory_results(results)
+    if args.json:
+        write_json_results(results.values())
+    else:
+        print_memory_results(results)
 
 
 if __name__ == "__main__":
@@ -10,25 +10,66 @@ This module provides common functions and classes for:
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import gc
+import json
+import os
 import sys
+import threading
 import time
+import timeit
 import tracemalloc
-from typing import Any
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from typing_extensions import Self
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from _typeshed import SupportsWrite
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
 try:
-    from html_to_markdown import convert
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from html_to_markdown import ConversionOptions, MetadataConfig, convert, create_options_handle
 except ImportError:
     sys.exit(1)
 
 
-# Shared test fixtures used across all performance examples
-FIXTURES = {
-    "small": {
-        "name": "Small Document (2 KB)",
-        "html": """
+def utf8_len(text: str) -> int:
+    """
+    Get the UTF-8 encoded size of a string.
+
+    ASCII-only input skips the encode entirely since its byte length equals
+    its character length.
+
+    Args:
+        text: String to measure
+
+    Returns:
+        Size in bytes when encoded as UTF-8
+    """
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-8"))
+
+
+_SMALL_HTML = """
         <html>
         <head><title>Small Example</title></head>
         <body>
@@ -43,11 +84,10 @@ FIXTURES = {
         <p>Perfect for testing cold-start overhead and baseline performance.</p>
         </body>
         </html>
-        """,
-    },
-    "medium": {
-        "name": "Medium Document (25 KB equivalent)",
-        "html": """
+        """
+
+# Page bodies repeated to build the medium and large fixtures
+_MEDIUM_BASE = """
         <html>
         <head><title>Blog Post: Web Performance Techniques</title></head>
         <body>
@@ -125,11 +165,8 @@ FIXTURES = {
         </body>
         </html>
         """
-        * 3,  # Multiply to reach ~25 KB
-    },
-    "large": {
-        "name": "Large Document (150 KB equivalent)",
-        "html": """
+
+_LARGE_BASE = """
         <html>
         <head><title>Comprehensive Wikipedia-style Article</title></head>
         <body>
@@ -331,9 +368,91 @@ FIXTURES = {
         </body>
         </html>
         """
-        * 3,  # Multiply to reach ~150 KB
-    },
-}
+
+
+@functools.cache
+def _build_fixture_html(body: str, repeat: int) -> str:
+    return body * repeat
+
+
+@dataclass(slots=True, frozen=True)
+class Fixture:
+    """
+    A shared benchmark document.
+
+    The HTML is built from ``body`` the first time it is read and cached from
+    then on, so fixtures a run never touches are never built. ``html_bytes``
+    is known from the body alone and is computed up front.
+    """
+
+    name: str
+    size: str
+    body: str = field(repr=False)
+    repeat: int = 1
+    html_bytes: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "html_bytes", utf8_len(self.body) * self.repeat)
+
+    @property
+    def html(self) -> str:
+        """HTML content of the fixture."""
+        return _build_fixture_html(self.body, self.repeat)
+
+
+# Shared test fixtures used across all performance examples
+FIXTURES = (
+    Fixture("Small Document (2 KB)", "small", _SMALL_HTML),
+    Fixture("Medium Document (25 KB equivalent)", "medium", _MEDIUM_BASE, 3),  # Multiply to reach ~25 KB
+    Fixture("Large Document (150 KB equivalent)", "large", _LARGE_BASE, 3),  # Multiply to reach ~150 KB
+)
+
+
+# Native options handles and metadata configs keyed on their frozen kwargs,
+# so repeated scenarios reuse one allocation instead of rebuilding it per call
+_OPTIONS_HANDLE_CACHE: dict[frozenset[tuple[str, Any]], Any] = {}
+_METADATA_CONFIG_CACHE: dict[frozenset[tuple[str, Any]], MetadataConfig] = {}
+
+
+def get_options_handle(**options: Any) -> Any:
+    """
+    Get a reusable options handle for the given ConversionOptions kwargs.
+
+    Args:
+        **options: Keyword arguments for ConversionOptions
+
+    Returns:
+        Cached options handle
+    """
+    key = frozenset(options.items())
+    handle = _OPTIONS_HANDLE_CACHE.get(key)
+    if handle is None:
+        handle = create_options_handle(ConversionOptions(**options))
+        _OPTIONS_HANDLE_CACHE[key] = handle
+    return handle
+
+
+def get_metadata_config(**config: Any) -> MetadataConfig:
+    """
+    Get a reusable MetadataConfig for the given kwargs.
+
+    Args:
+        **config: Keyword arguments for MetadataConfig
+
+    Returns:
+        Cached metadata configuration
+    """
+    key = frozenset(config.items())
+    metadata_config = _METADATA_CONFIG_CACHE.get(key)
+    if metadata_config is None:
+        metadata_config = MetadataConfig(**config)
+        _METADATA_CONFIG_CACHE[key] = metadata_config
+    return metadata_config
+
+
+# Format specs for common precisions, so format_number does not rebuild the
+# nested f-string spec on every call
+_NUMBER_SPECS = tuple(f",.{precision}f" for precision in range(10))
 
 
 def format_number(value: float, precision: int = 2) -> str:
@@ -347,7 +466,12 @@ def format_number(value: float, precision: int = 2) -> str:
     Returns:
         Formatted number string
     """
-    return f"{value:,.{precision}f}"
+    spec = _NUMBER_SPECS[precision] if 0 <= precision < len(_NUMBER_SPECS) else f",.{precision}f"
+    return format(value, spec)
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_SIZE_SCALES = tuple(1024**power for power in range(len(_SIZE_UNITS)))
 
 
 def format_size(size_bytes: int) -> str:
@@ -360,11 +484,10 @@ def format_size(size_bytes: int) -> str:
     Returns:
         Human-readable size string
     """
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.2f} TB"
+    # Each unit is a factor of 2**10, so the bit length picks the unit
+    # directly instead of dividing once per unit
+    index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size_bytes >= 1024 else 0
+    return f"{size_bytes / _SIZE_SCALES[index]:.2f} {_SIZE_UNITS[index]}"
 
 
 def format_duration(seconds: float) -> str:
@@ -387,26 +510,137 @@ def format_duration(seconds: float) -> str:
     return f"{minutes:.2f} min"
 
 
+@dataclass(slots=True)
+class BenchResult:
+    """Timing metrics for a single fixture benchmark."""
+
+    fixture: str
+    size_category: str
+    html_size_bytes: int
+    iterations: int
+    total_time_sec: float
+    avg_time_ms: float
+    throughput_docs_sec: float
+    bandwidth_mb_sec: float
+    scenario: str = "default"
+
+    @classmethod
+    def from_elapsed(
+        cls,
+        fixture: str,
+        size_category: str,
+        html_size_bytes: int,
+        iterations: int,
+        elapsed: float,
+        *,
+        scenario: str = "default",
+    ) -> Self:
+        """
+        Build a result from a timed run, deriving every rate in one place.
+
+        Args:
+            fixture: Display name of fixture
+            size_category: Size category (small/medium/large)
+            html_size_bytes: UTF-8 size of one document
+            iterations: Number of conversions timed
+            elapsed: Total time for all iterations, in seconds
+            scenario: Benchmark scenario (default: "default")
+
+        Returns:
+            Timing metrics
+        """
+        per_second = 1.0 / elapsed
+        return cls(
+            fixture=fixture,
+            size_category=size_category,
+            html_size_bytes=html_size_bytes,
+            iterations=iterations,
+            total_time_sec=elapsed,
+            avg_time_ms=elapsed * 1000 / iterations,
+            throughput_docs_sec=iterations * per_second,
+            bandwidth_mb_sec=html_size_bytes * iterations / (1024 * 1024) * per_second,
+            scenario=scenario,
+        )
+
+
+def pin_to_cpu(cpu: int | None = None) -> int | None:
+    """
+    Pin the current process to a single CPU for reproducible timings.
+
+    Avoids scheduler migrations between cores, which leave caches cold and
+    add variance to sub-millisecond measurements. When running as root the
+    process is also moved to the SCHED_FIFO real-time class.
+
+    Args:
+        cpu: CPU to pin to (default: $BENCH_CPU, else the highest allowed CPU)
+
+    Returns:
+        The CPU pinned to, or None when the platform has no affinity API
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    if cpu is None:
+        env_cpu = os.environ.get("BENCH_CPU")
+        cpu = int(env_cpu) if env_cpu else max(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {cpu})
+    if os.geteuid() == 0:
+        with contextlib.suppress(OSError):
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(1))
+    return cpu
+
+
+def warmup_iterations(iterations: int) -> int:
+    """
+    Get the number of untimed warmup runs for a benchmark.
+
+    A single call leaves allocator pools and caches partly cold, so warm up
+    with about a tenth of the measured iterations, capped at 5.
+
+    Args:
+        iterations: Number of measured iterations
+
+    Returns:
+        Number of warmup runs (1-5)
+    """
+    return min(5, max(1, iterations // 10))
+
+
 class TimingMeasurement:
     """Context manager for measuring execution time."""
 
-    def __init__(self, name: str = "Timing") -> None:
+    # Bound once on the class so entering and leaving the block is a single
+    # C call rather than a module global plus attribute lookup
+    _now = staticmethod(time.perf_counter_ns)
+
+    def __init__(self, name: str = "Timing", *, disable_gc: bool = False) -> None:
         """
         Initialize timing measurement.
 
         Args:
             name: Operation name for logging
+            disable_gc: Collect once up front, then keep the garbage collector
+                off for the timed region so collection pauses are not measured
         """
         self.name = name
+        self.disable_gc = disable_gc
         self.elapsed = 0.0
-        self._start_time = 0.0
+        self._start_ns = 0
+        self._gc_was_enabled = False
 
     def __enter__(self) -> Self:
-        self._start_time = time.perf_counter()
+        if self.disable_gc:
+            self._gc_was_enabled = gc.isenabled()
+            gc.collect()
+            gc.disable()
+        self._start_ns = self._now()
         return self
 
     def __exit__(self, *args: object) -> None:
-        self.elapsed = time.perf_counter() - self._start_time
+        # Integer nanoseconds avoid float rounding on sub-microsecond runs;
+        # convert to seconds only once, here
+        self.elapsed = (self._now() - self._start_ns) / 1e9
+        if self.disable_gc and self._gc_was_enabled:
+            gc.enable()
 
     @property
     def elapsed_ms(self) -> float:
@@ -419,30 +653,107 @@ class TimingMeasurement:
         return self.elapsed
 
 
+_PROCESS = psutil.Process() if psutil is not None else None
+
+
+def current_rss_bytes() -> int | None:
+    """
+    Get the resident set size of the current process.
+
+    Reads the live RSS from ``/proc/self/statm`` on Linux, then from psutil
+    when installed, and otherwise falls back to the ``getrusage`` high-water
+    mark, which only grows and so cannot show memory released mid-run.
+
+    Returns:
+        RSS in bytes, or None when the platform exposes none of these sources
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        return _PROCESS.memory_info().rss
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
 class MemoryTracker:
-    """Context manager for tracking memory usage during operations."""
+    """
+    Context manager for tracking memory usage during operations.
+
+    By default tracemalloc traces Python allocations exactly, at the cost of
+    slowing every allocation; tracing stays on across trackers until
+    ``shutdown_tracker()`` is called. With ``precise=False`` a background
+    thread samples process RSS instead, which also sees memory allocated by
+    the Rust core. RSS only moves in whole pages and the allocator reuses
+    pages freed by earlier work, so sampling is only meaningful for blocks
+    that run for many sample intervals and allocate well beyond what the
+    process already holds; tracemalloc is used when RSS is unavailable.
+    """
 
-    def __init__(self, operation_name: str = "Operation") -> None:
+    def __init__(
+        self,
+        operation_name: str = "Operation",
+        *,
+        precise: bool = True,
+        sample_interval: float = 0.01,
+    ) -> None:
         """
         Initialize memory tracker.
 
         Args:
             operation_name: Operation name for logging
+            precise: Use tracemalloc; pass False to sample RSS instead
+            sample_interval: Seconds between RSS samples (default: 100 Hz)
         """
         self.operation_name = operation_name
+        self.precise = precise or current_rss_bytes() is None
+        self.sample_interval = sample_interval
         self.baseline_memory = 0
         self.peak_memory = 0
+        self._peak_rss = 0
+        self._stop_sampling = threading.Event()
+        self._sampler: threading.Thread | None = None
 
     def __enter__(self) -> Self:
         gc.collect()
-        tracemalloc.start()
-        self.baseline_memory = tracemalloc.get_traced_memory()[0]
+        if self.precise:
+            # Tracing is left running between trackers; stopping it tears
+            # down the whole traceback table, which is costly after a large
+            # conversion, so only the peak is reset here
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.baseline_memory = tracemalloc.get_traced_memory()[0]
+            return self
+
+        self.baseline_memory = self._peak_rss = current_rss_bytes() or 0
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampler.start()
         return self
 
     def __exit__(self, *args: object) -> None:
-        _current, peak = tracemalloc.get_traced_memory()
-        self.peak_memory = peak
-        tracemalloc.stop()
+        if self.precise:
+            self.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - self.baseline_memory)
+            return
+
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._record_rss()
+        self.peak_memory = max(0, self._peak_rss - self.baseline_memory)
+
+    def _sample_rss(self) -> None:
+        while not self._stop_sampling.wait(self.sample_interval):
+            self._record_rss()
+
+    def _record_rss(self) -> None:
+        self._peak_rss = max(self._peak_rss, current_rss_bytes() or 0)
 
     @property
     def memory_used_kb(self) -> float:
@@ -460,69 +771,152 @@ class MemoryTracker:
         return self.peak_memory
 
 
-def measure_conversion_timing(
-    html: str,
-    fixture_name: str,
-    fixture_size: str,
-    iterations: int = 1,
-) -> dict[str, Any]:
+def shutdown_tracker() -> None:
+    """Stop the tracemalloc tracing left running by precise MemoryTrackers."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+ResultT = TypeVar("ResultT")
+
+
+def select_results(results: Mapping[tuple[str, str], ResultT], scenario: str) -> list[ResultT]:
+    """
+    Select one scenario's results from a (scenario, size category) index.
+
+    Args:
+        results: Results keyed by (scenario, size category)
+        scenario: Scenario to select
+
+    Returns:
+        Results for the scenario, in fixture order
+    """
+    return [results[scenario, fixture.size] for fixture in FIXTURES if (scenario, fixture.size) in results]
+
+
+def _conversion_timer(fixture: Fixture) -> timeit.Timer:
+    # timeit compiles the statement into its own loop, keeping interpreter
+    # loop overhead out of sub-millisecond fixtures, and turns GC off while
+    # timing. Names bound in setup are locals of that loop, so each call is a
+    # fast local load rather than a globals dict lookup
+    return timeit.Timer(
+        "convert_html(html)",
+        setup="convert_html = convert; html = fixture_html",
+        globals={"convert": convert, "fixture_html": fixture.html},
+    )
+
+
+def measure_conversion_timing(fixture: Fixture, iterations: int | None = 1) -> BenchResult:
     """
     Measure timing metrics for HTML conversion.
 
     Args:
-        html: HTML content to convert
-        fixture_name: Display name of fixture
-        fixture_size: Size category (small/medium/large)
-        iterations: Number of iterations
+        fixture: Fixture to convert
+        iterations: Number of iterations, or None to let ``timeit`` pick
+            enough to run for at least 0.2 seconds
 
     Returns:
-        Dictionary with timing metrics
+        Timing metrics
     """
-    html_bytes = len(html.encode("utf-8"))
+    timer = _conversion_timer(fixture)
 
-    # Warmup run
-    convert(html)
+    # Warmup runs
+    timer.timeit(warmup_iterations(iterations or 1))
 
-    # Measure conversions
-    with TimingMeasurement() as timer:
-        for _ in range(iterations):
-            convert(html)
+    gc.collect()
+    if iterations is None:
+        iterations, elapsed = timer.autorange()
+    else:
+        elapsed = timer.timeit(iterations)
+
+    return BenchResult.from_elapsed(fixture.name, fixture.size, fixture.html_bytes, iterations, elapsed)
+
+
+def measure_conversion_timing_sweep(
+    fixtures: Iterable[Fixture],
+    iteration_grid: Iterable[int],
+) -> list[BenchResult]:
+    """
+    Measure timing metrics for every fixture at every iteration count.
+
+    Each fixture gets one timer and one warmup for the whole grid, and only
+    raw elapsed times are recorded while measuring; the result objects and
+    their rates are built after the last timed run.
+
+    Args:
+        fixtures: Fixtures to convert
+        iteration_grid: Iteration counts to time each fixture at
+
+    Returns:
+        Timing metrics, grouped by fixture in grid order
+    """
+    grid = tuple(iteration_grid)
+    timings: list[tuple[Fixture, int, float]] = []
+    for fixture in fixtures:
+        timer = _conversion_timer(fixture)
+        timer.timeit(warmup_iterations(max(grid, default=1)))
+        for iterations in grid:
+            gc.collect()
+            timings.append((fixture, iterations, timer.timeit(iterations)))
+
+    return [
+        BenchResult.from_elapsed(fixture.name, fixture.size, fixture.html_bytes, iterations, elapsed)
+        for fixture, iterations, elapsed in timings
+    ]
+
+
+def format_section_header(title: str, width: int = 80) -> str:
+    """
+    Format a section header.
+
+    Args:
+        title: Section title
+        width: Header width (default: 80)
+
+    Returns:
+        Header text, newline-terminated
+    """
+    rule = "=" * width
+    return f"\n{rule}\n  {title}\n{rule}\n"
+
+
+def format_result_row(
+    label: str,
+    value: str | float,
+    format_spec: str = "",
+) -> str:
+    """
+    Format a result row.
 
-    # Calculate metrics
-    avg_time_ms = (timer.elapsed / iterations) * 1000
-    throughput_docs_sec = iterations / timer.elapsed
-    bytes_processed = html_bytes * iterations
-    bandwidth_mb_sec = (bytes_processed / (1024 * 1024)) / timer.elapsed
+    Args:
+        label: Row label
+        value: Value to print
+        format_spec: Optional format specification
 
-    return {
-        "fixture": fixture_name,
-        "size_category": fixture_size,
-        "html_size_bytes": html_bytes,
-        "iterations": iterations,
-        "total_time_sec": timer.elapsed,
-        "avg_time_ms": avg_time_ms,
-        "throughput_docs_sec": throughput_docs_sec,
-        "bandwidth_mb_sec": bandwidth_mb_sec,
-    }
+    Returns:
+        Row text, newline-terminated
+    """
+    value_str = format(value, format_spec) if isinstance(value, float) and format_spec else str(value)
+    return f"  {label:<40} {value_str:>30}\n"
 
 
-def print_section_header(title: str, width: int = 80) -> None:
+def print_section_header(title: str, width: int = 80, out: SupportsWrite[str] | None = None) -> None:
     """
     Print a formatted section header.
 
     Args:
         title: Section title
         width: Header width (default: 80)
+        out: Destination, such as an OutputBuffer (default: stdout)
     """
-    print("\n" + "=" * width)
-    print(f"  {title}")
-    print("=" * width)
+    (out or sys.stdout).write(format_section_header(title, width))
 
 
 def print_result_row(
     label: str,
     value: str | float,
     format_spec: str = "",
+    out: SupportsWrite[str] | None = None,
 ) -> None:
     """
     Print a formatted result row.
@@ -531,6 +925,88 @@ def print_result_row(
         label: Row label
         value: Value to print
         format_spec: Optional format specification
+        out: Destination, such as an OutputBuffer (default: stdout)
     """
-    value_str = format(value, format_spec) if isinstance(value, float) and format_spec else str(value)
-    print(f"  {label:<40} {value_str:>30}")
+    (out or sys.stdout).write(format_result_row(label, value, format_spec))
+
+
+class OutputBuffer:
+    """
+    Context manager that collects a report and writes it to stdout at once.
+
+    Reports made of many small rows otherwise pay a locked stdout write per
+    line, which shows up as jitter when output is piped to a CI log.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty output buffer."""
+        self._parts: list[str] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        sys.stdout.write("".join(self._parts))
+        sys.stdout.flush()
+        self._parts.clear()
+
+    def header(self, title: str, width: int = 80) -> None:
+        """
+        Add a formatted section header.
+
+        Args:
+            title: Section title
+            width: Header width (default: 80)
+        """
+        self._parts.append(format_section_header(title, width))
+
+    def row(
+        self,
+        label: str,
+        value: str | float,
+        format_spec: str = "",
+    ) -> None:
+        """
+        Add a formatted result row.
+
+        Args:
+            label: Row label
+            value: Value to print
+            format_spec: Optional format specification
+        """
+        self._parts.append(format_result_row(label, value, format_spec))
+
+    def blank(self) -> None:
+        """Add an empty line."""
+        self._parts.append("\n")
+
+    def write(self, text: str) -> int:
+        """
+        Add raw text, so the buffer can stand in for a text stream.
+
+        Args:
+            text: Text to add
+
+        Returns:
+            Number of characters added
+        """
+        self._parts.append(text)
+        return len(text)
+
+
+def write_json_results(results: Iterable[Any]) -> None:
+    """
+    Write dataclass results to stdout as a JSON array.
+
+    Uses orjson when installed, which serializes dataclasses natively in a
+    single call, and falls back to the standard library otherwise.
+
+    Args:
+        results: Result dataclass instances
+    """
+    records = list(results)
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        sys.stdout.write(json.dumps([asdict(record) for record in records], indent=2) + "\n")
+    sys.stdout.flush()
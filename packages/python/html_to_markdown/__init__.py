@@ -23,6 +23,7 @@ from html_to_markdown.api import (
     MetadataConfig,
     OptionsHandle,
     convert,
+    convert_many,
     convert_with_async_visitor,
     convert_with_handle,
     convert_with_inline_images,
@@ -59,6 +60,7 @@ __all__ = [
     "OptionsHandle",
     "PreprocessingOptions",
     "convert",
+    "convert_many",
     "convert_to_markdown",
     "convert_with_async_visitor",
     "convert_with_handle",
@@ -218,6 +218,7 @@ def convert_with_metadata_json(
 def create_options_handle(options: ConversionOptions | None = None) -> ConversionOptionsHandle: ...
 def create_options_handle_json(options_json: str | None = None) -> ConversionOptionsHandle: ...
 def convert_with_options_handle(html: str, handle: ConversionOptionsHandle) -> str: ...
+def convert_many(htmls: list[str], handle: ConversionOptionsHandle | None = None) -> list[str]: ...
 
 class NodeContext(TypedDict):
     node_type: str
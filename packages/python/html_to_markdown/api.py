@@ -182,6 +182,11 @@ def convert_with_handle(html: str, handle: OptionsHandle) -> str:
     return _rust.convert_with_options_handle(html, handle)
 
 
+def convert_many(htmls: list[str], handle: OptionsHandle | None = None) -> list[str]:
+    """Convert a batch of HTML documents in one native call, optionally using a pre-parsed handle."""
+    return _rust.convert_many(htmls, handle)
+
+
 def convert_with_metadata(
     html: str,
     options: ConversionOptions | None = None,
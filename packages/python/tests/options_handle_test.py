@@ -1,7 +1,24 @@
-from html_to_markdown import ConversionOptions, convert_with_handle, create_options_handle
+from html_to_markdown import ConversionOptions, convert_many, convert_with_handle, create_options_handle
 
 
 def test_convert_with_handle_uses_reusable_options() -> None:
     handle = create_options_handle(ConversionOptions(heading_style="atx_closed"))
     markdown = convert_with_handle("<h1>Hello</h1>", handle)
     assert "# Hello #" in markdown
+
+
+def test_convert_many_matches_per_document_conversion() -> None:
+    handle = create_options_handle(ConversionOptions(heading_style="atx_closed"))
+    htmls = ["<h1>Hello</h1>", "<p>World</p>"]
+    assert convert_many(htmls, handle) == [convert_with_handle(html, handle) for html in htmls]
+
+
+def test_convert_many_without_handle_uses_defaults() -> None:
+    markdowns = convert_many(["<h1>Hello</h1>"] * 3)
+    assert len(markdowns) == 3
+    assert all("Hello" in markdown for markdown in markdowns)
+
+
+def test_convert_many_preserves_non_ascii_documents() -> None:
+    htmls = ["<p>Héllo — 日本語</p>", "<h1>Ünïcödé 🚀</h1>"]
+    assert convert_many(htmls) == [convert_with_handle(html, create_options_handle()) for html in htmls]
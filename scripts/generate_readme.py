@@ -9,7 +9,10 @@ Adapted from kreuzberg.dev's README generation system.
 """
 
 import argparse
+import contextlib
+import hashlib
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Any
@@ -21,18 +24,54 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+    from jinja2 import (
+        Environment,
+        FileSystemBytecodeCache,
+        FileSystemLoader,
+        Template,
+        TemplateNotFound,
+        select_autoescape,
+    )
 except ImportError:
     print("Error: Jinja2 is required. Install with: pip install pyyaml jinja2")
     sys.exit(1)
 
 from readme_filters import CodeBlockHandler, FilterRegistry, PerformanceTableRenderer
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def newest_mtime(path: Path) -> float:
+    """
+    Get the newest modification time of a file or of any file under a directory.
+
+    Args:
+        path: File or directory to scan
+
+    Returns:
+        Newest st_mtime found, or 0.0 if the path does not exist
+    """
+    try:
+        newest = path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+    pending = [str(path)] if path.is_dir() else []
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    newest = max(newest, entry.stat().st_mtime)
+    return newest
+
+
 class ReadmeGenerator:
     """Handles README generation from templates and snippets."""
 
@@ -47,6 +86,13 @@ class ReadmeGenerator:
 
         self.config = {}
         self.jinja_env = None
+        # Let validation trust a README newer than all of its sources
+        self.trust_mtime = False
+        self._template_cache: dict[str, Template] = {}
+        self._ensured_dirs: set[Path] = set()
+        # Formatted snippets keyed by (language, path); snippets are shared
+        # across templates and do not change during a run
+        self._snippet_cache: dict[tuple[str, str], str] = {}
 
     def load_config(self) -> dict[str, Any]:
         """Load and parse README configuration from YAML."""
@@ -58,7 +104,7 @@ class ReadmeGenerator:
             )
 
         try:
-            self.config = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+            self.config = yaml.load(config_path.read_text(encoding="utf-8"), Loader=YamlLoader)  # noqa: S506 - always a safe loader
 
             if not self.config:
                 raise ValueError("Configuration file is empty")
@@ -76,11 +122,39 @@ class ReadmeGenerator:
                 f"Templates directory not found: {self.templates_dir}\nCreate readme_templates/ directory in scripts/"
             )
 
+        # Compiled templates persist between runs, so a validate followed by a
+        # generate (or repeated pre-commit runs) skips recompiling them. Jinja
+        # keys cached bytecode on template source only, yet environment
+        # options such as autoescape are compiled in, so the file names also
+        # carry a digest of this script, where those options are set
+        bytecode_dir = self.scripts_dir / ".jinja_cache"
+        generator_digest = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+        bytecode_cache: FileSystemBytecodeCache | None = None
+        try:
+            bytecode_dir.mkdir(exist_ok=True)
+            if not os.access(bytecode_dir, os.W_OK):
+                raise PermissionError(f"Cache directory is not writable: {bytecode_dir}")
+            # Bytecode compiled by earlier versions of this script can never
+            # be loaded again, so drop it instead of letting it accumulate
+            current_prefix = f"__jinja2_{generator_digest}_"
+            for cache_file in bytecode_dir.glob("__jinja2_*.cache"):
+                if not cache_file.name.startswith(current_prefix):
+                    with contextlib.suppress(OSError):
+                        cache_file.unlink()
+            bytecode_cache = FileSystemBytecodeCache(directory=str(bytecode_dir), pattern=f"{current_prefix}%s.cache")
+        except OSError as e:
+            # Read-only checkouts still render, just without the on-disk cache
+            logger.debug("Template bytecode cache disabled: %s", e)
+
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(self.templates_dir)),
             keep_trailing_newline=True,
-            autoescape=True,
+            # Templates render Markdown, so values are emitted raw; only
+            # HTML/XML templates would be escaped
+            autoescape=select_autoescape(),
+            bytecode_cache=bytecode_cache,
         )
+        self._template_cache.clear()
 
         # Register all custom filters using the centralized registry
         FilterRegistry.register_all(
@@ -110,23 +184,36 @@ class ReadmeGenerator:
             FileNotFoundError: If snippet file not found
             ValueError: If snippet format is invalid
         """
+        cache_key = (language, path)
+        cached = self._snippet_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        snippet = self._load_snippet(path, language)
+        self._snippet_cache[cache_key] = snippet
+        return snippet
+
+    def _load_snippet(self, path: str, language: str) -> str:
+        """Read and format a snippet for include_snippet_filter."""
         # Build snippet path
         snippet_path = self.snippets_dir / language / path
 
-        # Try with .md extension first if no extension provided
-        if not snippet_path.suffix:
-            md_path = snippet_path.with_suffix(".md")
-            if md_path.exists():
-                snippet_path = md_path
-
-        if not snippet_path.exists():
+        # Try with .md extension first if no extension provided. Opening each
+        # candidate directly replaces separate exists() checks with one open
+        # in the common case
+        candidates = (snippet_path.with_suffix(".md"), snippet_path) if not snippet_path.suffix else (snippet_path,)
+        for candidate in candidates:
+            try:
+                content = candidate.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                raise ValueError(f"Failed to read snippet {candidate}: {e}") from e
+            snippet_path = candidate
+            break
+        else:
             raise FileNotFoundError(f"Snippet not found: {snippet_path}\nLooking for: docs/snippets/{language}/{path}")
 
-        try:
-            content = snippet_path.read_text(encoding="utf-8")
-        except Exception as e:
-            raise ValueError(f"Failed to read snippet {snippet_path}: {e}") from e
-
         # Handle markdown files (extract code block)
         if snippet_path.suffix == ".md":
             return CodeBlockHandler.extract_code_block(content, snippet_path)
@@ -198,26 +285,22 @@ class ReadmeGenerator:
             **lang_config,
         }
 
-    def generate_readme(
-        self, lang_code: str, lang_config: dict[str, Any], output_path: Path, dry_run: bool = False
-    ) -> str:
+    def get_template(self, template_name: str) -> Template:
         """
-        Render README from template using language configuration.
+        Get a compiled template, loading it only once per generator.
 
         Args:
-            lang_code: Language code (python, go, etc.)
-            lang_config: Language-specific configuration
-            output_path: Where to write the README
-            dry_run: If True, don't write to disk
+            template_name: Template file name within readme_templates/
 
         Returns:
-            Generated README content
+            Compiled template
 
         Raises:
             TemplateNotFound: If template not found
-            Exception: Other rendering errors
         """
-        template_name = lang_config.get("template", f"{lang_code}.md.jinja")
+        template = self._template_cache.get(template_name)
+        if template is not None:
+            return template
 
         try:
             template = self.jinja_env.get_template(template_name)
@@ -226,21 +309,69 @@ class ReadmeGenerator:
                 f"Template not found: {template_name}\nExpected at: {self.templates_dir / template_name}"
             ) from e
 
+        self._template_cache[template_name] = template
+        return template
+
+    def render_readme(self, lang_code: str, lang_config: dict[str, Any]) -> str:
+        """
+        Render README content from template using language configuration.
+
+        Args:
+            lang_code: Language code (python, go, etc.)
+            lang_config: Language-specific configuration
+
+        Returns:
+            Rendered README content
+
+        Raises:
+            TemplateNotFound: If template not found
+            Exception: Other rendering errors
+        """
+        template_name = lang_config.get("template", f"{lang_code}.md.jinja")
+        template = self.get_template(template_name)
+
         # Prepare context and render template
         context = self._prepare_template_context(lang_code, lang_config)
-
         try:
             content = template.render(**context)
         except Exception as e:
             raise Exception(f"Failed to render template {template_name}: {e}") from e
 
         # Ensure content ends with exactly one newline (pre-commit hook requirement)
-        content = content.rstrip() + "\n"
+        return content.rstrip() + "\n"
+
+    def generate_readme(
+        self, lang_code: str, lang_config: dict[str, Any], output_path: Path, dry_run: bool = False
+    ) -> str:
+        """
+        Render README from template using language configuration.
+
+        Args:
+            lang_code: Language code (python, go, etc.)
+            lang_config: Language-specific configuration
+            output_path: Where to write the README
+            dry_run: If True, don't write to disk
+
+        Returns:
+            Generated README content
+
+        Raises:
+            TemplateNotFound: If template not found
+            Exception: Other rendering errors
+        """
+        content = self.render_readme(lang_code, lang_config)
 
         # Write to disk unless dry-run
         if not dry_run:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(content, encoding="utf-8")
+            parent = output_path.parent
+            if parent not in self._ensured_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(parent)
+            # Write the encoded README in one call under a temporary name, then
+            # swap it in so an interrupted run never leaves a truncated README
+            tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+            tmp_path.write_bytes(content.encode("utf-8"))
+            tmp_path.replace(output_path)
             logger.info("Generated: %s", output_path)
         else:
             logger.info("[DRY-RUN] Would generate: %s", output_path)
@@ -263,9 +394,20 @@ class ReadmeGenerator:
             logger.warning("README not found: %s", readme_path)
             return False
 
+        if self.trust_mtime:
+            try:
+                unchanged = readme_path.stat().st_mtime > self._newest_source_mtime(lang_code)
+            except OSError as e:
+                # e.g. a dangling symlink among the sources; compare content instead
+                logger.debug("Cannot compare mtimes for %s: %s", readme_path, e)
+                unchanged = False
+            if unchanged:
+                logger.info("Valid (unchanged sources): %s", readme_path)
+                return True
+
         try:
-            # Generate fresh README content
-            generated = self.generate_readme(lang_code, lang_config, readme_path, dry_run=True)
+            # Render fresh README content
+            generated = self.render_readme(lang_code, lang_config)
             existing = readme_path.read_text(encoding="utf-8")
 
             if generated == existing:
@@ -278,6 +420,18 @@ class ReadmeGenerator:
             logger.error("Validation error for %s: %s", readme_path, e)
             return False
 
+    def _newest_source_mtime(self, lang_code: str) -> float:
+        """Newest modification time of everything a language README is rendered from."""
+        sources = (
+            self.scripts_dir / "readme_config.yaml",
+            self.scripts_dir / "generate_readme.py",
+            self.scripts_dir / "readme_filters.py",
+            self.templates_dir,
+            self.snippets_dir / lang_code,
+            self.docs_dir / "migration-guides" / lang_code,
+        )
+        return max(newest_mtime(source) for source in sources)
+
     def resolve_output_path(self, lang_code: str, lang_config: dict[str, Any]) -> Path:
         """
         Resolve README output path with special handling for Go v2 structure.
@@ -357,6 +511,8 @@ class ReadmeGenerator:
             Exit code (0 for success, 1 for failure)
         """
         try:
+            self.trust_mtime = args.trust_mtime
+
             # Load configuration
             self.load_config()
 
@@ -406,6 +562,9 @@ Examples:
 
   # Validate specific language
   python scripts/generate_readme.py --language go --validate
+
+  # Quick local check that skips READMEs newer than their sources
+  python scripts/generate_readme.py --validate --trust-mtime
         """,
     )
 
@@ -427,6 +586,12 @@ Examples:
         help="Validate existing READMEs match generated output",
     )
 
+    parser.add_argument(
+        "--trust-mtime",
+        action="store_true",
+        help="With --validate, skip rendering READMEs newer than their templates, snippets and config",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -434,7 +599,10 @@ Examples:
         help="Enable verbose output",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.trust_mtime and not args.validate:
+        parser.error("--trust-mtime requires --validate")
+    return args
 
 
 def main() -> int:
@@ -31,6 +31,9 @@ except ImportError as e:
     print("Install dependencies: pip install pyyaml jinja2", file=sys.stderr)
     sys.exit(1)
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_schema(schema_path: Path) -> dict[str, Any]:
     """Load and validate the YAML schema."""
@@ -38,7 +41,7 @@ def load_schema(schema_path: Path) -> dict[str, Any]:
         raise FileNotFoundError(f"Schema file not found: {schema_path}")
 
     with schema_path.open(encoding="utf-8") as f:
-        schema = yaml.safe_load(f)
+        schema = yaml.load(f, Loader=YamlLoader)  # noqa: S506 - always a safe loader
 
     # Validate required keys
     required_keys = ["version", "metadata", "types", "callbacks", "generation"]
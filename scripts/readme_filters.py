@@ -9,6 +9,10 @@ import re
 from pathlib import Path
 from typing import Any, ClassVar
 
+# First fenced code block in a markdown snippet: optional language and title, then the body
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\s*(?:title="[^"]*")?\s*\n(.*?)```', re.DOTALL)
+_LEADING_WHITESPACE_RE = re.compile(r"\s*")
+
 
 class CodeBlockHandler:
     """Handles code block extraction and wrapping for snippet inclusion."""
@@ -44,8 +48,8 @@ class CodeBlockHandler:
         Raises:
             ValueError: If no code block found
         """
-        pattern = r'```(\w+)?\s*(?:title="[^"]*")?\s*\n(.*?)```'
-        match = re.search(pattern, content, re.DOTALL)
+        # A snippet without any fence can be rejected without running the regex
+        match = _CODE_BLOCK_RE.search(content) if "```" in content else None
 
         if not match:
             raise ValueError(
@@ -63,19 +67,26 @@ class CodeBlockHandler:
         """
         Wrap raw code in markdown code fences.
 
+        The fence language comes from the snippet's file extension, falling
+        back to the bare extension and then to ``language``.
+
         Args:
             content: Raw code content
             snippet_path: Path to snippet file
-            language: Language for syntax highlighting
+            language: Snippet language folder, used when the file has no extension
 
         Returns:
             Code wrapped in markdown fences
         """
-        content_stripped = content.lstrip()
-        if content_stripped.startswith("```"):
+        # Only the first non-whitespace characters matter; matching the
+        # whitespace prefix avoids the full copy that lstrip() would make
+        if content.startswith("```", _LEADING_WHITESPACE_RE.match(content).end()):
             return content
 
-        lang_id = CodeBlockHandler.LANGUAGE_MAP.get(language, snippet_path.suffix.lstrip(".") or "text")
+        # LANGUAGE_MAP is keyed by extension, so look up the suffix rather than
+        # the language folder name
+        suffix = snippet_path.suffix
+        lang_id = CodeBlockHandler.LANGUAGE_MAP.get(suffix) or suffix[1:] or language or "text"
 
         code = content.rstrip()
         return f"```{lang_id}\n{code}\n```\n"
@@ -129,12 +140,15 @@ class PerformanceTableRenderer:
     @staticmethod
     def _render_latency_table(benchmarks: list[dict[str, Any]]) -> str:
         """Render latency/throughput format table."""
-        table = "| Document | Size | Latency | Throughput |\n"
-        table += "| -------- | ---- | ------- | ---------- |\n"
-        for bench in benchmarks:
-            table += f"| {bench['name']} | {bench['size']} | "
-            table += f"{bench['latency']} | {bench['throughput']} |\n"
-        return table
+        rows = [
+            "| Document | Size | Latency | Throughput |",
+            "| -------- | ---- | ------- | ---------- |",
+        ]
+        rows.extend(
+            f"| {bench['name']} | {bench['size']} | {bench['latency']} | {bench['throughput']} |"
+            for bench in benchmarks
+        )
+        return "\n".join(rows) + "\n"
 
     @staticmethod
     def _render_ops_sec_table(benchmarks: list[dict[str, Any]]) -> str:
@@ -142,18 +156,22 @@ class PerformanceTableRenderer:
         has_throughput = "throughput" in benchmarks[0]
 
         if has_throughput:
-            table = "| Document | Size | Ops/sec | Throughput |\n"
-            table += "| -------- | ---- | ------- | ---------- |\n"
-            for bench in benchmarks:
-                table += f"| {bench['name']} | {bench['size']} | "
-                table += f"{bench['ops_sec']:,} | {bench['throughput']} |\n"
+            rows = [
+                "| Document | Size | Ops/sec | Throughput |",
+                "| -------- | ---- | ------- | ---------- |",
+            ]
+            rows.extend(
+                f"| {bench['name']} | {bench['size']} | {bench['ops_sec']:,} | {bench['throughput']} |"
+                for bench in benchmarks
+            )
         else:
-            table = "| Document | Size | Ops/sec |\n"
-            table += "| -------- | ---- | ------- |\n"
-            for bench in benchmarks:
-                table += f"| {bench['name']} | {bench['size']} | {bench['ops_sec']:,} |\n"
+            rows = [
+                "| Document | Size | Ops/sec |",
+                "| -------- | ---- | ------- |",
+            ]
+            rows.extend(f"| {bench['name']} | {bench['size']} | {bench['ops_sec']:,} |" for bench in benchmarks)
 
-        return table
+        return "\n".join(rows) + "\n"
 
 
 class FilterRegistry: